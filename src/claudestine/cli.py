@@ -1,14 +1,14 @@
 """Typer CLI for Claudestine."""
 
+import heapq
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import Annotated, Iterator, Optional
 
-import editor
-import questionary
 import typer
 from rich.console import Console
 from rich.panel import Panel
-from rich.syntax import Syntax
 
 from claudestine import __version__
 from claudestine.config import (
@@ -20,7 +20,6 @@ from claudestine.config import (
     load_workflow,
 )
 from claudestine.ui import Console as ClaudestineConsole
-from claudestine.workflow import WorkflowExecutor
 
 app = typer.Typer(
     name="claudestine",
@@ -38,6 +37,14 @@ app.add_typer(workflow_app)
 
 console = Console()
 
+# Plan discovery rules, matched against bare names during the tree walk
+_PLAN_DIR_NAME = "plans"
+_PLAN_SUFFIXES = ("-plan.md", "_plan.md")
+_SKIP_DIRS = frozenset({".git", "node_modules", ".venv", "venv", "__pycache__"})
+
+# Files that mark a project root when no git repository is found
+_PROJECT_MARKERS = ("pyproject.toml", "package.json")
+
 
 @app.callback(invoke_without_command=True)
 def main_callback(ctx: typer.Context):
@@ -48,6 +55,11 @@ def main_callback(ctx: typer.Context):
 
 def _interactive_mode():
     """Boot into interactive selection mode."""
+    import editor
+    import questionary
+
+    from claudestine.workflow import WorkflowExecutor
+
     cwd = Path.cwd()
 
     # ASCII art banner - Claudestine holding Claude in its palm
@@ -131,20 +143,7 @@ def _interactive_mode():
 
         else:
             # Step 2b: Implement mode - find and select existing plan
-            plan_patterns = [
-                "**/thoughts/shared/plans/*.md",
-                "**/thoughts/**/plans/*.md",
-                "**/plans/*.md",
-                "**/*-plan.md",
-                "**/*_plan.md",
-            ]
-
-            plans = []
-            for pattern in plan_patterns:
-                plans.extend(cwd.glob(pattern))
-
-            # Dedupe and sort
-            plans = sorted(set(plans), key=lambda p: p.stat().st_mtime, reverse=True)[:20]
+            plans = _find_plans(cwd)
 
             if not plans:
                 plan_path = questionary.path(
@@ -195,27 +194,26 @@ def _interactive_mode():
             working_dir = _resolve_working_dir(plan_path, None)
 
             # Step 3: Select workflow (implement mode only)
-            workflow_choices = [
-                questionary.Choice(title="Default workflow", value="default"),
-                questionary.Choice(title="Edit workflow before running", value="edit"),
-                questionary.Choice(title="Select custom workflow file", value="custom"),
-            ]
-
-            # Check for existing workflows
+            # Check for existing workflows; these are listed first
             project_workflow = get_project_config_dir(working_dir) / "workflow.yaml"
             global_workflow = get_config_dir() / "workflow.yaml"
 
+            workflow_choices = []
             if project_workflow.exists():
-                workflow_choices.insert(0, questionary.Choice(
+                workflow_choices.append(questionary.Choice(
                     title=f"Project workflow ({project_workflow.name})",
                     value="project",
                 ))
-
             if global_workflow.exists():
-                workflow_choices.insert(1, questionary.Choice(
+                workflow_choices.append(questionary.Choice(
                     title="Global workflow",
                     value="global",
                 ))
+            workflow_choices.extend([
+                questionary.Choice(title="Default workflow", value="default"),
+                questionary.Choice(title="Edit workflow before running", value="edit"),
+                questionary.Choice(title="Select custom workflow file", value="custom"),
+            ])
 
             workflow_choice = questionary.select(
                 "Select workflow:",
@@ -258,8 +256,7 @@ def _interactive_mode():
             yaml_content = workflow.to_yaml()
             edited = editor.editor(text=yaml_content)
             if edited:
-                import yaml
-                workflow = Workflow(**yaml.safe_load(edited))
+                workflow = Workflow.from_yaml_text(edited)
 
         # Step 3: Confirm options
         auto_push = questionary.confirm(
@@ -334,6 +331,41 @@ def _interactive_mode():
         console.print()
 
 
+def _find_plans(root: Path, limit: int = 20) -> list[Path]:
+    """Find plan files under root, most recently modified first.
+
+    Walks the tree once, matching markdown files inside a ``plans/``
+    directory (which covers ``thoughts/**/plans/``) and files named
+    ``*-plan.md`` or ``*_plan.md``. VCS, dependency and cache directories
+    are not descended into.
+    """
+    plans: list[tuple[float, str]] = []
+    pending = [os.fspath(root)]
+
+    while pending:
+        current = pending.pop()
+        in_plans_dir = os.path.basename(current) == _PLAN_DIR_NAME
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    name = entry.name
+                    # A failing entry (removed mid-walk, unreadable) is
+                    # skipped on its own so its siblings are still visited
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if name not in _SKIP_DIRS:
+                                pending.append(entry.path)
+                        elif name.endswith(".md") and entry.is_file():
+                            if in_plans_dir or name.endswith(_PLAN_SUFFIXES):
+                                plans.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+    return [Path(path) for _, path in heapq.nlargest(limit, plans)]
+
+
 def _resolve_working_dir(plan_path: Path, working_dir: Path | None) -> Path:
     """Resolve working directory from plan path.
 
@@ -354,32 +386,50 @@ def _resolve_working_dir(plan_path: Path, working_dir: Path | None) -> Path:
         resolved = Path(*resolved.parts[:thoughts_index])
         return resolved
 
+    return Path(_find_project_root(str(resolved)))
+
+
+@lru_cache(maxsize=16)
+def _find_project_root(start: str) -> str:
+    """Find the project root above start, caching results per directory.
+
+    Looks for the nearest enclosing git repository by checking for a
+    ``.git`` entry (a directory, or a file in worktrees and submodules)
+    rather than forking ``git rev-parse``. Falls back to the nearest
+    directory containing pyproject.toml or package.json, then to start.
+    """
     # Try to find git root
-    import subprocess
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            cwd=resolved,
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            return Path(result.stdout.strip())
-    except Exception:
-        pass
+    for directory in _ancestors(start):
+        if os.path.exists(os.path.join(directory, ".git")):
+            return directory
 
     # Try to find project root by looking for pyproject.toml or package.json
-    current = resolved
-    while current != current.parent:
-        if (current / "pyproject.toml").exists() or (current / "package.json").exists():
-            return current
-        current = current.parent
+    for directory in _ancestors(start):
+        if any(os.path.isfile(os.path.join(directory, m)) for m in _PROJECT_MARKERS):
+            return directory
+
+    return start
+
 
-    return resolved
+def _ancestors(start: str, max_depth: int = 32) -> Iterator[str]:
+    """Yield start and its parent directories, up to max_depth levels."""
+    current = start
+    for _ in range(max_depth):
+        yield current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return
+        current = parent
 
 
 def _get_default_workflow() -> Workflow:
-    """Get the default workflow template."""
+    """Get a fresh copy of the default workflow template."""
+    return _build_default_workflow().model_copy(deep=True)
+
+
+@lru_cache(maxsize=1)
+def _build_default_workflow() -> Workflow:
+    """Build the default workflow template once; callers receive copies."""
     from claudestine.config import Step, StepType
 
     return Workflow(
@@ -495,6 +545,8 @@ def run(
 
         claudestine run plan.md --no-push --dry-run
     """
+    from claudestine.workflow import WorkflowExecutor
+
     plan_path = plan_path.resolve()
     working_dir = _resolve_working_dir(plan_path, working_dir)
 
@@ -509,9 +561,11 @@ def run(
 
     # Edit workflow if requested
     if edit:
+        import editor
+
         yaml_content = workflow.to_yaml()
         edited = editor.editor(text=yaml_content)
-        workflow = Workflow(**__import__("yaml").safe_load(edited))
+        workflow = Workflow.from_yaml_text(edited)
 
     config = RunConfig(
         plan_path=plan_path,
@@ -553,6 +607,8 @@ def workflow_show(
     ] = None,
 ):
     """Show the current workflow configuration."""
+    from rich.syntax import Syntax
+
     working_dir = (working_dir or Path.cwd()).resolve()
 
     try:
@@ -601,13 +657,15 @@ def workflow_edit(
         workflow = _get_default_workflow()
 
     # Open in editor
+    import editor
+
     yaml_content = workflow.to_yaml()
     edited = editor.editor(text=yaml_content)
 
     if edited:
         # Validate and save
         try:
-            workflow = Workflow(**__import__("yaml").safe_load(edited))
+            workflow = Workflow.from_yaml_text(edited)
             workflow.save(workflow_path)
             console.print(f"[green]✓[/green] Saved to {workflow_path}")
         except Exception as e:
@@ -1,12 +1,19 @@
 """Configuration models for Claudestine."""
 
+import os
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import yaml
 from pydantic import BaseModel, Field
 
+try:
+    from yaml import CSafeDumper as _YamlDumper, CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper, SafeLoader as _YamlLoader  # type: ignore[assignment]
+
 
 class StepType(str, Enum):
     """Type of workflow step."""
@@ -50,10 +57,20 @@ class Workflow(BaseModel):
 
     @classmethod
     def from_yaml(cls, path: Path) -> "Workflow":
-        """Load workflow from YAML file."""
-        with open(path) as f:
-            data = yaml.safe_load(f)
-        return cls(**data)
+        """
+        Load workflow from YAML file.
+
+        Parsed workflows are cached by path and modification time, so
+        repeat loads of an unchanged file skip YAML parsing and validation.
+        A copy is returned because callers mutate the result.
+        """
+        cached = _load_cached(str(path), path.stat().st_mtime_ns)
+        return cached.model_copy(deep=True)
+
+    @classmethod
+    def from_yaml_text(cls, text: str) -> "Workflow":
+        """Load workflow from a YAML string (e.g. editor output)."""
+        return cls.model_validate(yaml.load(text, Loader=_YamlLoader))
 
     def to_yaml(self) -> str:
         """Export workflow to YAML string."""
@@ -61,6 +78,7 @@ class Workflow(BaseModel):
         data = self.model_dump(exclude_none=True, mode="json")
         return yaml.dump(
             data,
+            Dumper=_YamlDumper,
             default_flow_style=False,
             sort_keys=False,
             allow_unicode=True,
@@ -73,6 +91,13 @@ class Workflow(BaseModel):
             f.write(self.to_yaml())
 
 
+@lru_cache(maxsize=32)
+def _load_cached(path_str: str, mtime_ns: int) -> Workflow:
+    """Parse a workflow file; keyed on mtime so edits invalidate the entry."""
+    with open(path_str) as f:
+        return Workflow.from_yaml_text(f.read())
+
+
 class RunConfig(BaseModel):
     """Configuration for a single run."""
 
@@ -84,6 +109,9 @@ class RunConfig(BaseModel):
     verbose: bool = False
 
 
+_BUNDLED_WORKFLOW = Path(__file__).parent.parent.parent / "workflows" / "default.yaml"
+
+
 def get_config_dir() -> Path:
     """Get the global config directory."""
     return Path.home() / ".config" / "claudestine"
@@ -107,20 +135,20 @@ def find_workflow(working_dir: Path, workflow_name: str | None = None) -> Path |
     """
     filename = f"{workflow_name}.yaml" if workflow_name else "workflow.yaml"
 
-    # 1. Project-specific
-    project_path = get_project_config_dir(working_dir) / filename
-    if project_path.exists():
-        return project_path
-
-    # 2. Global config
-    global_path = get_config_dir() / filename
-    if global_path.exists():
-        return global_path
-
-    # 3. Bundled default
-    bundled_path = Path(__file__).parent.parent.parent / "workflows" / "default.yaml"
-    if bundled_path.exists():
-        return bundled_path
+    candidates = (
+        # 1. Project-specific
+        get_project_config_dir(working_dir) / filename,
+        # 2. Global config
+        get_config_dir() / filename,
+        # 3. Bundled default
+        _BUNDLED_WORKFLOW,
+    )
+    for candidate in candidates:
+        try:
+            os.stat(candidate)
+        except OSError:
+            continue
+        return candidate
 
     return None
 
@@ -142,8 +170,12 @@ def load_workflow(
     Raises:
         FileNotFoundError: If no workflow found.
     """
-    if workflow_path and workflow_path.exists():
-        return Workflow.from_yaml(workflow_path)
+    if workflow_path is not None:
+        try:
+            return Workflow.from_yaml(workflow_path)
+        except (FileNotFoundError, NotADirectoryError):
+            # Same cases Path.exists() reported as missing
+            pass
 
     found_path = find_workflow(working_dir)
     if found_path:
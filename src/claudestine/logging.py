@@ -1,7 +1,35 @@
 """Logging for Claudestine workflow execution."""
 
-from datetime import datetime
+import atexit
+import time
 from pathlib import Path
+from types import TracebackType
+from typing import Iterable
+
+# Write buffer for the log handle; sized so a typical step's records and
+# summaries coalesce into a few writes
+_BUFFER_SIZE = 64 * 1024
+
+# Characters replaced when deriving the log filename from the plan name
+_SAFE_NAME_TABLE = str.maketrans({"/": "_", " ": "_"})
+
+# Characters of step output kept in the collapsible summary
+_SUMMARY_LIMIT = 500
+
+# Markdown templates; each log call fills one and issues a single write
+_TPL_HEADER = "# Claudestine Execution Log\n\n**Plan:** %s\n**Started:** %s\n\n---\n\n"
+_TPL_PHASE_HEADER = "## Phase %d\n\n"
+_TPL_STEP_HEADER = "### %s (%s)\n\n*Started: %s*\n\n"
+_TPL_STEP_STATUS = "**Status:** %s (%.1fs)\n\n"
+_TPL_SUMMARY_DETAILS = "<details>\n<summary>Output Summary</summary>\n\n```\n%s\n```\n</details>\n\n"
+_TPL_PHASE_RESULT = "**Phase %d Result:** %s\n\n---\n\n"
+_TPL_SUMMARY = (
+    "## Summary\n\n"
+    "- **Status:** %s\n"
+    "- **Phases Completed:** %d\n"
+    "- **Duration:** %.1fs\n"
+    "- **Ended:** %s\n"
+)
 
 
 class WorkflowLogger:
@@ -18,26 +46,29 @@ class WorkflowLogger:
         self.log_dir = log_dir / "logs"
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = plan_name.replace("/", "_").replace(" ", "_").replace(".md", "")
+        started = time.localtime()
+        timestamp = time.strftime("%Y%m%d_%H%M%S", started)
+        safe_name = plan_name.removesuffix(".md").translate(_SAFE_NAME_TABLE)
         self.log_path = self.log_dir / f"{timestamp}_{safe_name}.md"
 
-        self._start_time = datetime.now()
+        self._start_monotonic = time.monotonic()
         self._current_phase = 0
 
-        self._write("# Claudestine Execution Log\n\n")
-        self._write(f"**Plan:** {plan_name}\n")
-        self._write(f"**Started:** {self._start_time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        self._write("---\n\n")
+        # Keep one handle open for the session rather than reopening per write
+        self._fh = open(self.log_path, "a", buffering=_BUFFER_SIZE, encoding="utf-8")
+        atexit.register(self.close)
+
+        self._write(
+            _TPL_HEADER % (plan_name, time.strftime("%Y-%m-%d %H:%M:%S", started))
+        )
 
     def log_step_start(self, step_name: str, step_type: str, phase: int) -> None:
         """Log the start of a workflow step."""
+        record = _TPL_STEP_HEADER % (step_name, step_type, time.strftime("%H:%M:%S"))
         if phase != self._current_phase:
             self._current_phase = phase
-            self._write(f"## Phase {phase}\n\n")
-
-        self._write(f"### {step_name} ({step_type})\n\n")
-        self._write(f"*Started: {datetime.now().strftime('%H:%M:%S')}*\n\n")
+            record = _TPL_PHASE_HEADER % phase + record
+        self._write(record)
 
     def log_step_complete(
         self,
@@ -48,48 +79,77 @@ class WorkflowLogger:
     ) -> None:
         """Log the completion of a workflow step."""
         status = "SUCCESS" if success else "FAILED"
-        self._write(f"**Status:** {status} ({duration_seconds:.1f}s)\n\n")
+        self._write(_TPL_STEP_STATUS % (status, duration_seconds))
 
         if output_summary:
-            self._write("<details>\n<summary>Output Summary</summary>\n\n```\n")
-            self._write(output_summary[:500])
-            if len(output_summary) > 500:
-                self._write("\n... (truncated)")
-            self._write("\n```\n</details>\n\n")
+            if len(output_summary) > _SUMMARY_LIMIT:
+                output_summary = output_summary[:_SUMMARY_LIMIT] + "\n... (truncated)"
+            self._write(_TPL_SUMMARY_DETAILS % output_summary)
 
     def log_phase_complete(self, phase: int, plan_complete: bool) -> None:
         """Log the completion of a workflow phase."""
-        if plan_complete:
-            self._write(f"**Phase {phase} Result:** Plan complete\n\n")
-        else:
-            self._write(f"**Phase {phase} Result:** Continuing to next phase\n\n")
-        self._write("---\n\n")
+        result = "Plan complete" if plan_complete else "Continuing to next phase"
+        self._write(_TPL_PHASE_RESULT % (phase, result))
+        self._checkpoint()
 
     def log_session_end(self, success: bool, total_phases: int) -> None:
         """Log the end of the workflow session."""
-        duration = (datetime.now() - self._start_time).total_seconds()
+        duration = time.monotonic() - self._start_monotonic
         status = "SUCCESS" if success else "FAILED"
 
-        self._write("## Summary\n\n")
-        self._write(f"- **Status:** {status}\n")
-        self._write(f"- **Phases Completed:** {total_phases}\n")
-        self._write(f"- **Duration:** {duration:.1f}s\n")
-        self._write(f"- **Ended:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self._write(
+            _TPL_SUMMARY
+            % (status, total_phases, duration, time.strftime("%Y-%m-%d %H:%M:%S"))
+        )
+        self._checkpoint()
 
     def log_error(self, step_name: str, error: str) -> None:
         """Log an error during workflow execution."""
         self._write(f"**ERROR in {step_name}:**\n\n```\n{error}\n```\n\n")
+        self._checkpoint()
+
+    def log_claude_output(self, step_name: str, lines: Iterable[str]) -> None:
+        """
+        Log Claude's full output for a step.
 
-    def log_claude_output(self, step_name: str, output: str) -> None:
-        """Log Claude's full output for a step."""
+        Lines are written as they are produced, so large outputs are never
+        joined into one string in memory.
+        """
         self._write("<details>\n<summary>Full Claude Output</summary>\n\n```\n")
-        self._write(output)
-        self._write("\n```\n</details>\n\n")
+        for line in lines:
+            self._write(line)
+            self._write("\n")
+        self._write("```\n</details>\n\n")
+
+    def _checkpoint(self) -> None:
+        """
+        Push buffered text to the OS at a record boundary.
+
+        Called at errors, phase ends and session end, so anyone tailing the
+        log sees progress at least once per phase.
+        """
+        self._fh.flush()
+
+    def close(self) -> None:
+        """Flush and close the log file."""
+        if not self._fh.closed:
+            self._fh.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "WorkflowLogger":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
 
     def _write(self, text: str) -> None:
         """Append text to the log file."""
-        with open(self.log_path, "a") as f:
-            f.write(text)
+        self._fh.write(text)
 
     def get_log_path(self) -> Path:
         """Return the path to the current log file."""
@@ -1,17 +1,23 @@
 """Claude CLI runner with real-time streaming output."""
 
+import io
 import json
 import os
 import re
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import IO, Callable, Iterator
 
 from claudestine.ui.console import StepOutput
 
+# Terminal escape sequences stripped from plain-text output
+_ANSI_ESCAPE_RE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+# Fallback for session IDs in lines that are not valid JSON
+_SESSION_ID_RE = re.compile(r'"session_id":\s*"([^"]+)"')
 
-@dataclass
+
+@dataclass(slots=True)
 class ClaudeResult:
     """Result from a Claude CLI execution."""
 
@@ -40,6 +46,7 @@ class ClaudeRunner:
         """
         self.working_dir = working_dir
         self.allowed_tools = allowed_tools
+        self._env = self._build_env()
         self._session_id: str | None = None
         # Token tracking - stores latest values (not accumulated)
         self._input_tokens: int = 0
@@ -80,14 +87,17 @@ class ClaudeRunner:
         self._interrupted = False
 
         try:
-            # Use unbuffered output for real-time streaming
+            compiled_stops = [
+                (pattern, re.compile(pattern, re.IGNORECASE))
+                for pattern in stop_patterns or ()
+            ]
+
             process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 cwd=self.working_dir,
-                env=self._get_env(),
-                bufsize=0,  # Unbuffered
+                env=self._env,
             )
             self._process = process
 
@@ -100,14 +110,12 @@ class ClaudeRunner:
                 )
 
             # Read line by line for streaming
-            for line_bytes in iter(process.stdout.readline, b""):
+            for line in _iter_lines(process.stdout):
                 # Check if interrupted
                 if self._interrupted:
                     stop_reason = "Interrupted by user"
                     break
 
-                line = line_bytes.decode("utf-8", errors="replace").rstrip()
-
                 if not line:
                     continue
 
@@ -121,13 +129,10 @@ class ClaudeRunner:
                     on_line(line)
 
                 # Check for stop patterns
-                if stop_patterns:
-                    for pattern in stop_patterns:
-                        if re.search(pattern, line, re.IGNORECASE):
-                            stop_reason = f"Pattern matched: {pattern}"
-
-                # Try to extract session ID from JSON output
-                self._try_extract_session_id(line)
+                for pattern, stop_re in compiled_stops:
+                    if stop_re.search(line):
+                        stop_reason = f"Pattern matched: {pattern}"
+                        break
 
             exit_code = process.wait()
 
@@ -194,6 +199,7 @@ class ClaudeRunner:
         commands: list[str],
         output: StepOutput | None = None,
         skip_if_clean: bool = False,
+        git_status: list[tuple[str, str]] | None = None,
     ) -> ClaudeResult:
         """
         Run shell commands directly.
@@ -202,6 +208,7 @@ class ClaudeRunner:
             commands: List of shell commands to run.
             output: StepOutput to stream to.
             skip_if_clean: Skip if git working tree is clean.
+            git_status: Already fetched result of get_git_status, if any.
 
         Returns:
             ClaudeResult with execution details.
@@ -209,13 +216,9 @@ class ClaudeRunner:
         all_output: list[str] = []
 
         if skip_if_clean:
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=self.working_dir,
-                capture_output=True,
-                text=True,
-            )
-            if not result.stdout.strip():
+            if git_status is None:
+                git_status = get_git_status(self.working_dir)
+            if not git_status:
                 if output:
                     output.append("[dim]No changes to commit[/dim]")
                 return ClaudeResult(
@@ -236,12 +239,10 @@ class ClaudeRunner:
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
                     cwd=self.working_dir,
-                    bufsize=0,
                 )
 
                 if process.stdout:
-                    for line_bytes in iter(process.stdout.readline, b""):
-                        line = line_bytes.decode("utf-8", errors="replace").rstrip()
+                    for line in _iter_lines(process.stdout):
                         if line:
                             all_output.append(line)
                             if output:
@@ -324,8 +325,8 @@ class ClaudeRunner:
 
         return cmd
 
-    def _get_env(self) -> dict:
-        """Get environment variables for subprocess."""
+    def _build_env(self) -> dict:
+        """Build environment variables for subprocess."""
         env = os.environ.copy()
         # Disable colours in Claude output for cleaner parsing
         env["NO_COLOR"] = "1"
@@ -338,139 +339,173 @@ class ClaudeRunner:
         if not line.strip():
             return ""
 
-        # Try to parse as JSON (stream-json format)
-        try:
-            data = json.loads(line)
-            return self._format_stream_event(data)
-        except json.JSONDecodeError:
-            pass
+        # Try to parse as JSON (stream-json format); plain text lines skip
+        # the decoder entirely rather than raising and catching an error
+        if line.lstrip().startswith("{"):
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                pass
+            else:
+                # Stream-json events carry the session ID, so take it from
+                # this parse rather than decoding the line a second time
+                if "session_id" in data:
+                    self._session_id = data["session_id"]
+                return self._format_stream_event(data)
+
+        self._try_extract_session_id(line)
 
         # Fallback: plain text formatting
-        ansi_escape = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-        clean = ansi_escape.sub("", line)
+        clean = _ANSI_ESCAPE_RE.sub("", line)
 
         if not clean.strip():
             return ""
 
         if clean.startswith("> "):
             return f"[cyan]{clean}[/cyan]"
-        if "error" in clean.lower():
+        lowered = clean.lower()
+        if "error" in lowered:
             return f"[red]{clean}[/red]"
-        if "success" in clean.lower() or "✓" in clean:
+        if "success" in lowered or "✓" in clean:
             return f"[green]{clean}[/green]"
 
         return clean
 
     def _format_stream_event(self, data: dict) -> str:
         """Format a stream-json event for display."""
-        event_type = data.get("type", "")
-
-        if event_type == "system" and data.get("subtype") == "init":
-            session_id = data.get("session_id", "")
-            self._session_id = session_id
-            return f"[dim]Session: {session_id[:8]}...[/dim]"
-
-        if event_type == "assistant":
-            message = data.get("message", {})
-            content = message.get("content", [])
-
-            # Extract usage data - store latest values (not accumulated)
-            usage = message.get("usage", {})
-            if usage:
-                self._input_tokens = usage.get("input_tokens", 0)
-                self._output_tokens = usage.get("output_tokens", 0)
-                self._cache_creation_tokens = usage.get("cache_creation_input_tokens", 0)
-                self._cache_read_tokens = usage.get("cache_read_input_tokens", 0)
-
-            lines = []
-            for item in content:
-                if item.get("type") == "text":
-                    text = item.get("text", "")
-                    if text:
-                        lines.append(text)
-                elif item.get("type") == "tool_use":
-                    tool = item.get("name", "unknown")
-                    input_data = item.get("input", {})
-
-                    if tool == "Edit":
-                        file_path = input_data.get("file_path", "")
-                        old_str = input_data.get("old_string", "")[:60]
-                        new_str = input_data.get("new_string", "")[:60]
-                        lines.append(f"[cyan]> Edit:[/cyan] {file_path}")
-                        if old_str:
-                            lines.append(f"  [dim red]- {old_str!r}[/dim red]")
-                        if new_str:
-                            lines.append(f"  [dim green]+ {new_str!r}[/dim green]")
-
-                    elif tool == "Write":
-                        file_path = input_data.get("file_path", "")
-                        content_len = len(input_data.get("content", ""))
-                        lines.append(f"[cyan]> Write:[/cyan] {file_path} ({content_len} chars)")
-
-                    elif tool == "Read":
-                        file_path = input_data.get("file_path", "")
-                        lines.append(f"[cyan]> Read:[/cyan] {file_path}")
-
-                    elif tool == "Bash":
-                        cmd = input_data.get("command", "")
-                        if len(cmd) > 80:
-                            cmd = cmd[:77] + "..."
-                        lines.append(f"[cyan]> Bash:[/cyan] {cmd}")
-
-                    elif tool == "Glob":
-                        pattern = input_data.get("pattern", "")
-                        path = input_data.get("path", ".")
-                        lines.append(f"[cyan]> Glob:[/cyan] {pattern} in {path}")
-
-                    elif tool == "Grep":
-                        pattern = input_data.get("pattern", "")
-                        path = input_data.get("path", ".")
-                        lines.append(f"[cyan]> Grep:[/cyan] {pattern!r} in {path}")
-
-                    elif tool == "Task":
-                        desc = input_data.get("description", "")
-                        agent = input_data.get("subagent_type", "")
-                        lines.append(f"[cyan]> Task:[/cyan] {desc} ({agent})")
-
-                    elif tool == "WebFetch":
-                        url = input_data.get("url", "")
-                        lines.append(f"[cyan]> WebFetch:[/cyan] {url}")
-
-                    elif tool == "WebSearch":
-                        query = input_data.get("query", "")
-                        lines.append(f"[cyan]> WebSearch:[/cyan] {query}")
-
-                    else:
-                        # Generic fallback for unknown tools
-                        input_str = str(input_data)[:80]
-                        lines.append(f"[cyan]> {tool}:[/cyan] {input_str}")
-
-            return "\n".join(lines) if lines else ""
-
-        if event_type == "tool_result":
-            return "[dim]> Tool completed[/dim]"
-
-        if event_type == "result":
-            result = data.get("result", "")
-            if result:
-                return "[green]Done[/green]"
-
+        handler = self._STREAM_EVENT_HANDLERS.get(data.get("type", ""))
         # Skip other event types
+        return handler(self, data) if handler else ""
+
+    def _format_system_event(self, data: dict) -> str:
+        """Format a system event, recording the session from init."""
+        if data.get("subtype") != "init":
+            return ""
+        session_id = data.get("session_id", "")
+        self._session_id = session_id
+        return f"[dim]Session: {session_id[:8]}...[/dim]"
+
+    def _format_assistant_event(self, data: dict) -> str:
+        """Format an assistant message with its text and tool calls."""
+        message = data.get("message", {})
+        content = message.get("content", [])
+
+        # Extract usage data - store latest values (not accumulated)
+        usage = message.get("usage", {})
+        if usage:
+            self._input_tokens = usage.get("input_tokens", 0)
+            self._output_tokens = usage.get("output_tokens", 0)
+            self._cache_creation_tokens = usage.get("cache_creation_input_tokens", 0)
+            self._cache_read_tokens = usage.get("cache_read_input_tokens", 0)
+
+        lines = []
+        for item in content:
+            if item.get("type") == "text":
+                text = item.get("text", "")
+                if text:
+                    lines.append(text)
+            elif item.get("type") == "tool_use":
+                tool = item.get("name", "unknown")
+                input_data = item.get("input", {})
+
+                if tool == "Edit":
+                    file_path = input_data.get("file_path", "")
+                    old_str = input_data.get("old_string", "")[:60]
+                    new_str = input_data.get("new_string", "")[:60]
+                    lines.append(f"[cyan]> Edit:[/cyan] {file_path}")
+                    if old_str:
+                        lines.append(f"  [dim red]- {old_str!r}[/dim red]")
+                    if new_str:
+                        lines.append(f"  [dim green]+ {new_str!r}[/dim green]")
+
+                elif tool == "Write":
+                    file_path = input_data.get("file_path", "")
+                    content_len = len(input_data.get("content", ""))
+                    lines.append(f"[cyan]> Write:[/cyan] {file_path} ({content_len} chars)")
+
+                elif tool == "Read":
+                    file_path = input_data.get("file_path", "")
+                    lines.append(f"[cyan]> Read:[/cyan] {file_path}")
+
+                elif tool == "Bash":
+                    cmd = input_data.get("command", "")
+                    if len(cmd) > 80:
+                        cmd = cmd[:77] + "..."
+                    lines.append(f"[cyan]> Bash:[/cyan] {cmd}")
+
+                elif tool == "Glob":
+                    pattern = input_data.get("pattern", "")
+                    path = input_data.get("path", ".")
+                    lines.append(f"[cyan]> Glob:[/cyan] {pattern} in {path}")
+
+                elif tool == "Grep":
+                    pattern = input_data.get("pattern", "")
+                    path = input_data.get("path", ".")
+                    lines.append(f"[cyan]> Grep:[/cyan] {pattern!r} in {path}")
+
+                elif tool == "Task":
+                    desc = input_data.get("description", "")
+                    agent = input_data.get("subagent_type", "")
+                    lines.append(f"[cyan]> Task:[/cyan] {desc} ({agent})")
+
+                elif tool == "WebFetch":
+                    url = input_data.get("url", "")
+                    lines.append(f"[cyan]> WebFetch:[/cyan] {url}")
+
+                elif tool == "WebSearch":
+                    query = input_data.get("query", "")
+                    lines.append(f"[cyan]> WebSearch:[/cyan] {query}")
+
+                else:
+                    # Generic fallback for unknown tools
+                    input_str = str(input_data)[:80]
+                    lines.append(f"[cyan]> {tool}:[/cyan] {input_str}")
+
+        return "\n".join(lines) if lines else ""
+
+    def _format_tool_result_event(self, data: dict) -> str:
+        """Format a tool result event."""
+        return "[dim]> Tool completed[/dim]"
+
+    def _format_result_event(self, data: dict) -> str:
+        """Format the final result event."""
+        if data.get("result", ""):
+            return "[green]Done[/green]"
         return ""
 
+    # Stream-json event type -> formatter, looked up once per line
+    _STREAM_EVENT_HANDLERS: dict[str, Callable[["ClaudeRunner", dict], str]] = {
+        "system": _format_system_event,
+        "assistant": _format_assistant_event,
+        "tool_result": _format_tool_result_event,
+        "result": _format_result_event,
+    }
+
     def _try_extract_session_id(self, line: str) -> None:
-        """Try to extract session ID from output."""
-        # Look for session_id in JSON
-        if "session_id" in line:
-            try:
-                data = json.loads(line)
-                if "session_id" in data:
-                    self._session_id = data["session_id"]
-            except (json.JSONDecodeError, TypeError):
-                # Try regex fallback
-                match = re.search(r'"session_id":\s*"([^"]+)"', line)
-                if match:
-                    self._session_id = match.group(1)
+        """Try to extract session ID from non-JSON output."""
+        # Only lines carrying a session_id key are worth searching
+        if '"session_id"' not in line:
+            return
+        match = _SESSION_ID_RE.search(line)
+        if match:
+            self._session_id = match.group(1)
+
+
+def _iter_lines(stream: IO[bytes]) -> Iterator[str]:
+    """
+    Yield decoded lines from a subprocess pipe as they arrive.
+
+    Args:
+        stream: Buffered binary pipe from Popen.
+
+    Yields:
+        Each line with trailing whitespace removed.
+    """
+    # Decode in the IO layer rather than per line; newline="\n" splits on
+    # "\n" only, as readline on the raw pipe did
+    reader = io.TextIOWrapper(stream, encoding="utf-8", errors="replace", newline="\n")
+    for line in reader:
+        yield line.rstrip()
 
 
 def get_git_status(working_dir: Path) -> list[tuple[str, str]]:
@@ -488,14 +523,15 @@ def get_git_status(working_dir: Path) -> list[tuple[str, str]]:
             ["git", "status", "--porcelain"],
             cwd=working_dir,
             capture_output=True,
-            text=True,
         )
 
+        # Work on bytes and decode only the paths. Lines are not stripped, as
+        # a leading space is part of the two-column status.
         files = []
-        for line in result.stdout.strip().split("\n"):
+        for line in result.stdout.splitlines():
             if line:
-                status = line[:2].strip() or "?"
-                filepath = line[3:]
+                status = line[:2].strip().decode("ascii", errors="replace") or "?"
+                filepath = line[3:].decode("utf-8", errors="replace")
                 files.append((status, filepath))
 
         return files
@@ -504,24 +540,38 @@ def get_git_status(working_dir: Path) -> list[tuple[str, str]]:
         return []
 
 
-def generate_commit_message(working_dir: Path) -> str:
+def generate_commit_message(
+    working_dir: Path,
+    files: list[tuple[str, str]] | None = None,
+) -> str:
     """
     Generate a conventional commit message based on changes.
 
     Args:
         working_dir: Git repository directory.
+        files: Already fetched result of get_git_status, if any.
 
     Returns:
         Conventional commit message.
     """
-    files = get_git_status(working_dir)
+    if files is None:
+        files = get_git_status(working_dir)
 
     if not files:
         return "chore: no changes"
 
-    added = [f for s, f in files if s in ("A", "??")]
-    modified = [f for s, f in files if s == "M"]
-    deleted = [f for s, f in files if s == "D"]
+    added: list[str] = []
+    modified: list[str] = []
+    deleted: list[str] = []
+    all_files: list[str] = []
+    for status, filepath in files:
+        all_files.append(filepath)
+        if status in ("A", "??"):
+            added.append(filepath)
+        elif status == "M":
+            modified.append(filepath)
+        elif status == "D":
+            deleted.append(filepath)
 
     if added and not modified and not deleted:
         action = "feat"
@@ -536,17 +586,20 @@ def generate_commit_message(working_dir: Path) -> str:
         action = "chore"
         desc = "update"
 
-    all_files = [f for _, f in files]
-    common_dir = os.path.commonpath(all_files) if all_files else ""
-
-    if common_dir and "/" in common_dir:
-        scope = common_dir.split("/")[0]
-    elif all_files:
-        scope = Path(all_files[0]).stem
+    # Scope is the top-level directory when every file sits under it
+    first = all_files[0]
+    top_dir, sep, _ = first.partition("/")
+    prefix = top_dir + "/"
+    # Untracked directories are reported with a trailing slash
+    name = first.rstrip("/").rsplit("/", 1)[-1]
+    if sep and all(f.startswith(prefix) for f in all_files):
+        scope = top_dir
     else:
-        scope = "misc"
+        # Same rule as Path.stem
+        dot = name.rfind(".")
+        scope = name[:dot] if 0 < dot < len(name) - 1 else name
 
     if len(all_files) == 1:
-        return f"{action}({scope}): {desc} {Path(all_files[0]).name}"
+        return f"{action}({scope}): {desc} {name}"
     else:
         return f"{action}({scope}): {desc} {len(all_files)} files"
@@ -1,12 +1,15 @@
 """Rich console output with collapsible sections."""
 
+from collections import deque
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import TYPE_CHECKING, Generator
 
 from rich.console import Console as RichConsole, Group, RenderableType
 
 if TYPE_CHECKING:
     from claudestine.runner import ClaudeRunner
+from rich.errors import MarkupError
 from rich.live import Live
 from rich.panel import Panel
 from rich.progress import (
@@ -23,6 +26,60 @@ from rich.text import Text
 from rich.tree import Tree
 
 
+# Step status -> (colour, icon) for panel titles
+_STEP_STATUS_STYLES = {
+    "running": ("yellow", "●"),
+    "success": ("green", "✓"),
+    "failed": ("red", "✗"),
+    "skipped": ("dim", "⊘"),
+}
+
+# Git file status -> colour for the files changed table
+_FILE_STATUS_STYLES = {
+    "A": "green",   # Added
+    "M": "yellow",  # Modified
+    "D": "red",     # Deleted
+    "?": "cyan",    # Untracked
+}
+
+# Message prefixes, parsed once instead of on every message
+_INFO_PREFIX = Text.from_markup("[blue]>[/blue] ")
+_SUCCESS_PREFIX = Text.from_markup("[green]✓[/green] ")
+_WARNING_PREFIX = Text.from_markup("[yellow]![/yellow] ")
+_ERROR_PREFIX = Text.from_markup("[red]✗[/red] ")
+
+
+@lru_cache(maxsize=64)
+def _step_title(status: str, name: str) -> Text:
+    """Build the panel title for a step; Panel copies it when rendering."""
+    colour, icon = _STEP_STATUS_STYLES.get(status, ("white", "?"))
+    return Text.from_markup(f"[{colour}]{icon}[/{colour}] {name}")
+
+
+def _line_text(line: str) -> Text:
+    """Parse an output line as markup, or show it verbatim if it is not valid markup."""
+    try:
+        return Text.from_markup(line)
+    except MarkupError:
+        # Streamed Claude text can contain brackets that look like tags
+        return Text(line)
+
+
+@lru_cache(maxsize=4)
+def _footer_panel(paused: bool, manual_mode: bool) -> Panel:
+    """Build the controls hint footer; there are only three variants."""
+    if paused:
+        if manual_mode:
+            footer_text = "[yellow]MANUAL MODE[/yellow] - Type your prompt and press Enter"
+        else:
+            footer_text = "[yellow]PAUSED[/yellow] - Press [bold]C[/bold] to continue, [bold]M[/bold] for manual"
+        border_style = "yellow"
+    else:
+        footer_text = "[dim]Press [bold]P[/bold] to pause, [bold]M[/bold] for manual, Ctrl+C to stop[/dim]"
+        border_style = "dim"
+    return Panel(Text.from_markup(footer_text), border_style=border_style)
+
+
 class StepOutput:
     """Collapsible output collector for a step."""
 
@@ -36,28 +93,42 @@ class StepOutput:
         """
         self.name = name
         self.console = console
-        self.lines: list[str] = []
+        # Only the count and the visible tail are kept, so memory stays
+        # bounded however much a step prints
+        self.line_count = 0
+        self._visible: deque[str] = deque(maxlen=self.MAX_VISIBLE_LINES)
         self.collapsed = False
         self.status = "running"  # running, success, failed, skipped
+        # Last rendered panel and the state it was rendered from
+        self._cached_panel: Panel | None = None
+        self._cache_key: tuple[str, bool, int] | None = None
 
     def append(self, line: str) -> None:
         """Add a line of output."""
-        self.lines.append(line)
+        self.line_count += 1
+        if line.strip():
+            self._visible.append(line)
         if not self.collapsed:
             self.console.refresh()
 
     def set_status(self, status: str) -> None:
         """Set the step status."""
+        if status == self.status:
+            return
         self.status = status
         self.console.refresh()
 
     def collapse(self) -> None:
         """Collapse the output."""
+        if self.collapsed:
+            return
         self.collapsed = True
         self.console.refresh()
 
     def expand(self) -> None:
         """Expand the output."""
+        if not self.collapsed:
+            return
         self.collapsed = False
         self.console.refresh()
 
@@ -65,20 +136,21 @@ class StepOutput:
 
     def render(self) -> Panel:
         """Render the step output as a Rich Panel."""
-        status_styles = {
-            "running": ("yellow", "●"),
-            "success": ("green", "✓"),
-            "failed": ("red", "✗"),
-            "skipped": ("dim", "⊘"),
-        }
-        colour, icon = status_styles.get(self.status, ("white", "?"))
-
-        title = f"[{colour}]{icon}[/{colour}] {self.name}"
+        # Lines are only ever appended, so the count identifies the content
+        key = (self.status, self.collapsed, self.line_count)
+        if self._cached_panel is None or key != self._cache_key:
+            self._cached_panel = self._build_panel()
+            self._cache_key = key
+        return self._cached_panel
+
+    def _build_panel(self) -> Panel:
+        """Build the panel for the current state."""
+        colour, _ = _STEP_STATUS_STYLES.get(self.status, ("white", "?"))
+        title = _step_title(self.status, self.name)
 
         if self.collapsed:
-            line_count = len(self.lines)
             return Panel(
-                Text(f"[{line_count} lines]", style="dim"),
+                Text(f"[{self.line_count} lines]", style="dim"),
                 title=title,
                 title_align="left",
                 border_style="dim",
@@ -86,14 +158,14 @@ class StepOutput:
             )
 
         # Fixed height: show last N lines only
-        visible_lines = [line for line in self.lines if line.strip()][-self.MAX_VISIBLE_LINES:]
+        visible_lines = list(self._visible)
 
         if visible_lines:
-            if len(self.lines) > self.MAX_VISIBLE_LINES:
-                header = f"[dim]... ({len(self.lines) - self.MAX_VISIBLE_LINES} more above)[/dim]\n"
-                content = Text.from_markup(header + "\n".join(visible_lines))
-            else:
-                content = Text.from_markup("\n".join(visible_lines))
+            # Lines are parsed one by one so a single bad line cannot break the panel
+            content = Text("\n").join(_line_text(line) for line in visible_lines)
+            if self.line_count > self.MAX_VISIBLE_LINES:
+                hidden = self.line_count - self.MAX_VISIBLE_LINES
+                content = Text(f"... ({hidden} more above)\n", style="dim") + content
         else:
             content = Text("(waiting...)", style="dim")
 
@@ -132,9 +204,17 @@ class Console:
         self._runner: "ClaudeRunner | None" = None
         self._paused: bool = False
         self._manual_mode: bool = False
+        # Last rendered layout; rebuilt lazily when marked dirty
+        self._frame: Group | None = None
+        self._dirty: bool = True
+        # Header panel and the values it was built from
+        self._header: Panel | None = None
+        self._header_key: tuple | None = None
 
     def set_paused(self, paused: bool) -> None:
         """Set pause state."""
+        if paused == self._paused:
+            return
         self._paused = paused
         self.refresh()
 
@@ -144,6 +224,8 @@ class Console:
 
     def set_manual_mode(self, manual: bool) -> None:
         """Set manual mode state."""
+        if manual == self._manual_mode:
+            return
         self._manual_mode = manual
         self.refresh()
 
@@ -185,16 +267,21 @@ class Console:
             total=total_steps,
         )
 
+        # The cached frame still holds the previous Progress
+        self.refresh()
+
         self._live = Live(
-            self._render(),
             console=self.console,
             refresh_per_second=4,
             transient=False,
+            get_renderable=self._get_frame,
         )
         self._live.start()
 
     def set_total_phases(self, total: int) -> None:
         """Set the total number of phases in the plan."""
+        if total == self._total_phases:
+            return
         self._total_phases = total
         self.refresh()
 
@@ -240,11 +327,14 @@ class Console:
             completed=self._current_step_num,
         )
 
+        # The cached frame still holds the previous Progress
+        self.refresh()
+
         self._live = Live(
-            self._render(),
             console=self.console,
             refresh_per_second=4,
             transient=False,
+            get_renderable=self._get_frame,
         )
         self._live.start()
 
@@ -255,15 +345,61 @@ class Console:
             self._live = None
 
     def refresh(self) -> None:
-        """Refresh the display."""
-        if self._live:
-            self._live.update(self._render())
+        """
+        Mark the display as changed.
+
+        Live pulls the layout on its own refresh tick, so a burst of
+        updates between ticks costs a single render.
+        """
+        self._dirty = True
+
+    def _get_frame(self) -> Group:
+        """Return the current layout, rendering it only if it changed."""
+        if self._dirty or self._frame is None:
+            self._dirty = False
+            try:
+                self._frame = self._render()
+            except Exception:
+                # This runs on Live's refresh thread, which an exception
+                # would stop for good; keep showing the last good frame
+                if self._frame is None:
+                    self._frame = Group()
+        return self._frame
 
     def _render(self) -> Group:
         """Render the full display."""
         renderables: list[RenderableType] = []
 
         # Header with phase, step, and context info
+        renderables.append(self._render_header())
+
+        # Progress bar
+        if self._progress:
+            renderables.append(self._progress)
+
+        # Only show the current step (last one in the list). Slicing keeps
+        # this safe if the step list is cleared during a refresh tick.
+        for current in self.steps[-1:]:
+            renderables.append(current.render())
+
+        # Footer with controls hint
+        renderables.append(_footer_panel(self._paused, self._manual_mode))
+
+        return Group(*renderables)
+
+    def _render_header(self) -> Panel:
+        """Render the header, reusing the last panel if its inputs match."""
+        usage = self._runner.get_context_usage() if self._runner else None
+        key = (
+            self._current_phase,
+            self._total_phases,
+            self._current_step_num,
+            self._total_steps,
+            usage,
+        )
+        if self._header is not None and key == self._header_key:
+            return self._header
+
         header = Table.grid(expand=True)
         header.add_column()
         header.add_column(justify="right")
@@ -273,38 +409,17 @@ class Console:
 
         # Add context usage if runner is available
         context_info = ""
-        if self._runner:
-            tokens, window, pct = self._runner.get_context_usage()
+        if usage:
+            tokens, window, pct = usage
             context_info = f"[dim]Context: {tokens // 1000}k/{window // 1000}k ({pct:.1f}%)[/dim] "
 
         header.add_row(
             "[bold cyan]Claudestine[/bold cyan] [dim]v0.2.0[/dim]",
             f"{context_info}[dim]{phase_info} | Step {self._current_step_num}/{self._total_steps}[/dim]",
         )
-        renderables.append(Panel(header, border_style="cyan"))
-
-        # Progress bar
-        if self._progress:
-            renderables.append(self._progress)
-
-        # Only show the current step (last one in the list)
-        if self.steps:
-            renderables.append(self.steps[-1].render())
-
-        # Footer with controls hint
-        if self._paused:
-            if self._manual_mode:
-                footer_text = "[yellow]MANUAL MODE[/yellow] - Type your prompt and press Enter"
-            else:
-                footer_text = "[yellow]PAUSED[/yellow] - Press [bold]C[/bold] to continue, [bold]M[/bold] for manual"
-            border_style = "yellow"
-        else:
-            footer_text = "[dim]Press [bold]P[/bold] to pause, [bold]M[/bold] for manual, Ctrl+C to stop[/dim]"
-            border_style = "dim"
-        footer = Text.from_markup(footer_text)
-        renderables.append(Panel(footer, border_style=border_style))
-
-        return Group(*renderables)
+        self._header = Panel(header, border_style="cyan")
+        self._header_key = key
+        return self._header
 
     @contextmanager
     def step(
@@ -360,7 +475,7 @@ class Console:
 
             self.current_step = None
 
-    def print(self, message: str, style: str | None = None) -> None:
+    def print(self, message: str | Text, style: str | None = None) -> None:
         """Print a message (outside of steps)."""
         if self._live:
             self._live.console.print(message, style=style)
@@ -369,19 +484,19 @@ class Console:
 
     def info(self, message: str) -> None:
         """Print an info message."""
-        self.print(f"[blue]>[/blue] {message}")
+        self.print(Text.assemble(_INFO_PREFIX, message))
 
     def success(self, message: str) -> None:
         """Print a success message."""
-        self.print(f"[green]✓[/green] {message}")
+        self.print(Text.assemble(_SUCCESS_PREFIX, message))
 
     def warning(self, message: str) -> None:
         """Print a warning message."""
-        self.print(f"[yellow]![/yellow] {message}")
+        self.print(Text.assemble(_WARNING_PREFIX, message))
 
     def error(self, message: str) -> None:
         """Print an error message."""
-        self.print(f"[red]✗[/red] {message}")
+        self.print(Text.assemble(_ERROR_PREFIX, message))
 
     def rule(self, title: str = "") -> None:
         """Print a horizontal rule."""
@@ -409,15 +524,8 @@ class Console:
         table.add_column("Status", style="bold", width=8)
         table.add_column("File")
 
-        status_styles = {
-            "A": "green",   # Added
-            "M": "yellow",  # Modified
-            "D": "red",     # Deleted
-            "?": "cyan",    # Untracked
-        }
-
         for status, filepath in files:
-            style = status_styles.get(status, "white")
+            style = _FILE_STATUS_STYLES.get(status, "white")
             table.add_row(f"[{style}]{status}[/{style}]", filepath)
 
         self.console.print(table)
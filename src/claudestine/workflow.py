@@ -3,7 +3,10 @@
 import json
 import re
 import time
+from itertools import islice
+from pathlib import Path
 from string import Template
+from typing import Iterator
 
 import questionary
 
@@ -18,6 +21,11 @@ from claudestine.runner import (
 from claudestine.ui.console import Console, StepOutput
 from claudestine.ui.keyboard import KeyAction, KeyboardController
 
+# Plan file markers, compiled once rather than per phase check
+_PHASE_HEADER_RE = re.compile(r"^##\s+Phase\s+\d+", re.MULTILINE | re.IGNORECASE)
+_PHASE_MENTION_RE = re.compile(r"##\s+Phase\s+\d+", re.IGNORECASE)
+_PHASE_COMPLETE_RE = re.compile(r"\*\*Status:\*\*\s*complete", re.IGNORECASE)
+
 
 class WorkflowExecutor:
     """Executes a workflow against a plan."""
@@ -103,13 +111,13 @@ class WorkflowExecutor:
                         continue
 
                     # Check for manual mode between steps
-                    if self._pending_action == KeyAction.MANUAL:
+                    if self._pending_action is KeyAction.MANUAL:
                         self._handle_manual_mode()
                         self._pending_action = None
 
                     # Wait while paused (but not in manual mode)
-                    while self.console.is_paused() and self._pending_action != KeyAction.MANUAL:
-                        if self._pending_action == KeyAction.CONTINUE:
+                    while self.console.is_paused() and self._pending_action is not KeyAction.MANUAL:
+                        if self._pending_action is KeyAction.CONTINUE:
                             self._pending_action = None
                             break
                         time.sleep(0.1)
@@ -175,6 +183,7 @@ class WorkflowExecutor:
             if self._keyboard:
                 self._keyboard.stop()
             self.console.stop()
+            self.logger.close()
 
     def _handle_key_action(self, action: KeyAction) -> None:
         """
@@ -185,12 +194,12 @@ class WorkflowExecutor:
         """
         self._pending_action = action
 
-        if action == KeyAction.PAUSE:
+        if action is KeyAction.PAUSE:
             self.runner.interrupt()
             self.console.set_paused(True)
-        elif action == KeyAction.CONTINUE:
+        elif action is KeyAction.CONTINUE:
             self.console.set_paused(False)
-        elif action == KeyAction.MANUAL:
+        elif action is KeyAction.MANUAL:
             self.runner.interrupt()
             self.console.set_paused(True)
             self.console.set_manual_mode(True)
@@ -235,7 +244,7 @@ class WorkflowExecutor:
         try:
             content = self.config.plan_path.read_text()
             # Count "## Phase X" headers
-            return len(re.findall(r"^##\s+Phase\s+\d+", content, re.MULTILINE | re.IGNORECASE))
+            return len(_PHASE_HEADER_RE.findall(content))
         except Exception:
             return 0
 
@@ -265,12 +274,17 @@ class WorkflowExecutor:
             return "\n".join(lines)[:500]
         return output[:500] if output else None
 
-    def _format_output_for_log(self, output: str) -> str:
-        """Format Claude output for readable log."""
+    def _format_output_for_log(self, output: str) -> Iterator[str]:
+        """
+        Format Claude output for readable log.
+
+        Yields log lines one at a time so the logger can stream them to disk
+        without building a second full-size copy of the output.
+        """
         if not output:
-            return ""
+            return
 
-        lines = []
+        emitted = False
         for line in output.split("\n"):
             if not line.strip():
                 continue
@@ -283,23 +297,28 @@ class WorkflowExecutor:
                         if item.get("type") == "text":
                             text = item.get("text", "").strip()
                             if text:
-                                lines.append(text)
+                                emitted = True
+                                yield text
                         elif item.get("type") == "tool_use":
                             tool = item.get("name", "unknown")
-                            lines.append(f"[Tool: {tool}]")
+                            emitted = True
+                            yield f"[Tool: {tool}]"
 
                 elif data.get("type") == "result":
                     result = data.get("result", "")
                     if result:
-                        lines.append(f"\n--- Result ---\n{result}")
+                        emitted = True
+                        yield f"\n--- Result ---\n{result}"
 
             except (json.JSONDecodeError, TypeError):
                 # Not JSON, include as-is if it looks meaningful
                 clean = line.strip()
                 if clean and not clean.startswith("{"):
-                    lines.append(clean)
+                    emitted = True
+                    yield clean
 
-        return "\n".join(lines) if lines else output
+        if not emitted:
+            yield output
 
     def execute_dry_run(self) -> None:
         """Show what would be executed without running."""
@@ -341,11 +360,11 @@ class WorkflowExecutor:
             Result of the step execution.
         """
         with self.console.step(step.name) as output:
-            if step.type == StepType.CLAUDE:
+            if step.type is StepType.CLAUDE:
                 return self._execute_claude_step(step, output)
-            elif step.type == StepType.SHELL:
+            elif step.type is StepType.SHELL:
                 return self._execute_shell_step(step, output)
-            elif step.type == StepType.INTERNAL:
+            elif step.type is StepType.INTERNAL:
                 return self._execute_internal_step(step, output)
             else:
                 output.append(f"[red]Unknown step type: {step.type}[/red]")
@@ -395,11 +414,17 @@ class WorkflowExecutor:
         # Substitute variables in commands
         commands = [self._substitute_variables(cmd) for cmd in step.commands]
 
+        # Fetch `git status` at most once per step and share it between the
+        # clean-tree check and commit message generation
+        needs_message = any("{commit_message}" in cmd for cmd in commands)
+        git_status = None
+        if needs_message or step.skip_if_clean:
+            git_status = get_git_status(self.config.working_dir)
+
         # Handle commit message generation
-        commands = [
-            cmd.replace("{commit_message}", generate_commit_message(self.config.working_dir))
-            for cmd in commands
-        ]
+        if needs_message:
+            commit_message = generate_commit_message(self.config.working_dir, git_status)
+            commands = [cmd.replace("{commit_message}", commit_message) for cmd in commands]
 
         # Handle auto_push flag
         if not self.config.auto_push:
@@ -409,6 +434,7 @@ class WorkflowExecutor:
             commands=commands,
             output=output,
             skip_if_clean=step.skip_if_clean,
+            git_status=git_status,
         )
 
     def _execute_internal_step(self, step: Step, output: StepOutput) -> ClaudeResult:
@@ -454,12 +480,12 @@ class WorkflowExecutor:
 
         # For create mode, try to find the created plan from plan_directory
         if not plan_path and "plan_directory" in self.variables:
-            from pathlib import Path
             plan_dir = Path(self.variables["plan_directory"])
             if plan_dir.exists():
-                plans = sorted(plan_dir.glob("*.md"), key=lambda p: p.stat().st_mtime, reverse=True)
-                if plans:
-                    plan_path = plans[0]
+                # Newest plan only; no need to sort the whole directory
+                newest = max(plan_dir.glob("*.md"), key=lambda p: p.stat().st_mtime, default=None)
+                if newest is not None:
+                    plan_path = newest
                     # Update variables so verify/update steps can use it
                     self.variables["plan_path"] = str(plan_path)
 
@@ -474,11 +500,13 @@ class WorkflowExecutor:
             # Check for verification complete marker (for create mode)
             if "## Status: Verified" in content:
                 return True
-            # Count completed vs total phases
-            completed = len(re.findall(r"\*\*Status:\*\*\s*complete", content, re.I))
-            total = len(re.findall(r"##\s+Phase\s+\d+", content, re.I))
-            if total > 0 and completed >= total:
-                return True
+            # Count completed vs total phases. The completion scan is skipped
+            # for plans without phase headings and stops once it reaches total.
+            total = len(_PHASE_MENTION_RE.findall(content))
+            if total > 0:
+                matches = islice(_PHASE_COMPLETE_RE.finditer(content), total)
+                if sum(1 for _ in matches) >= total:
+                    return True
         except Exception:
             pass
 